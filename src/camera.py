@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 
 import math
+import os
 import random
 import sys
+import time
 from typing import Final
 from vec3 import Vector3, Point3
 from color import Color, write_color
@@ -23,18 +25,28 @@ class Camera:
     up_direction: Vector3 = Vector3(0.0, 1.0, 0.0)
     defocus_angle: float = 0.0  # Variation angle of rays through each pixel (deg)
     focus_distance: float = 10.0  # Distance from camera to plane of perfect focus (m)
+    preview_scale: int = 8  # Pixel block size of the low-resolution preview pass (px)
+    time_budget: float | None = None  # Wall-clock limit of a progressive render (s)
+    save_interval: float = 10.0  # Wall-clock time between progressive saves (s)
+    output_path: str = "output.ppm"  # Destination of progressive renders
+    crop: tuple[int, int, int, int] | None = None  # (x_min, y_min, x_max, y_max) px
+    tile_size: int = 16  # Side of the square tiles rendered by the scheduler (px)
+    tile_priority: dict[tuple[int, int], float] | None = None  # Higher renders first
+    tile_samples: dict[tuple[int, int], int] | None = None  # Samples per pixel override
 
     image_height: int  # px
     center: Point3
     pixel00_location: Point3
     pixel_delta_u: Vector3
     pixel_delta_v: Vector3
-    pixel_samples_scale: float  # Color scale factor for a sum of pizel samples
     u: Vector3
     v: Vector3
     w: Vector3
     defocus_disk_u: Vector3
     defocus_disk_v: Vector3
+    window: tuple[int, int, int, int]  # Rendered sub-rectangle of the full frame (px)
+    window_width: int  # px
+    window_height: int  # px
 
     def __init__(self):
         pass
@@ -64,8 +76,6 @@ class Camera:
         if self.image_height < 1:
             self.image_height = 1
 
-        self.pixel_samples_scale = 1 / self.samples_per_pixel
-
         self.center = self.lookfrom
 
         # Determine viewport dimensions
@@ -105,6 +115,21 @@ class Camera:
         self.defocus_disk_u = self.u * defocus_radius
         self.defocus_disk_v = self.v * defocus_radius
 
+        # Clip the crop window to the full frame, whose pixel grid is kept as is
+        x_min, y_min, x_max, y_max = (
+            self.crop
+            if self.crop is not None
+            else (0, 0, self.image_width, self.image_height)
+        )
+        x_min = max(0, min(x_min, self.image_width))
+        y_min = max(0, min(y_min, self.image_height))
+        x_max = max(x_min, min(x_max, self.image_width))
+        y_max = max(y_min, min(y_max, self.image_height))
+        assert x_max > x_min and y_max > y_min, "Empty crop window"
+        self.window = (x_min, y_min, x_max, y_max)
+        self.window_width = x_max - x_min
+        self.window_height = y_max - y_min
+
     def sample_square(self):
         """
         Returns the vector to a random point in the [(-0.5, -0.5), (0.5, 0.5)] unit square.
@@ -136,20 +161,178 @@ class Camera:
 
         return Ray(ray_origin, ray_direction)
 
+    def tile_samples_per_pixel(self, tile: tuple[int, int]):
+        """
+        Returns the number of samples per pixel of the tile at index (column, row).
+        """
+        if self.tile_samples is None:
+            return self.samples_per_pixel
+        return self.tile_samples.get(tile, self.samples_per_pixel)
+
+    def tiles(self):
+        """
+        Returns the tiles overlapping the crop window as (column, row) indices and
+        full-frame pixel bounds (x_min, y_min, x_max, y_max), clipped to the window.
+        Tiles are sorted by decreasing priority, then in scanline order.
+        """
+        x_min, y_min, x_max, y_max = self.window
+        size = max(1, self.tile_size)
+        tiles = [
+            (
+                (column, row),
+                (
+                    max(x_min, column * size),
+                    max(y_min, row * size),
+                    min(x_max, (column + 1) * size),
+                    min(y_max, (row + 1) * size),
+                ),
+            )
+            for row in range(y_min // size, (y_max - 1) // size + 1)
+            for column in range(x_min // size, (x_max - 1) // size + 1)
+        ]
+        if self.tile_priority is not None:
+            priority = self.tile_priority
+            tiles.sort(key=lambda tile: -priority.get(tile[0], 0.0))
+        return tiles
+
     def render(self, world: HittableList):
         self.initialize()
 
-        sys.stdout.write(f"P3\n{self.image_width} {self.image_height}\n255\n")
-        for i in range(self.image_height):
-            sys.stderr.write(f"\rScanlines remaining: {self.image_height - i}")
+        x_min, y_min, _, _ = self.window
+        pixels = [
+            [Vector3.zero() for _ in range(self.window_width)]
+            for _ in range(self.window_height)
+        ]
+        tiles = self.tiles()
+        for k, (tile, (tile_x_min, tile_y_min, tile_x_max, tile_y_max)) in enumerate(
+            tiles
+        ):
+            sys.stderr.write(f"\rTiles remaining: {len(tiles) - k}")
+            sys.stderr.flush()
+            samples_per_pixel = self.tile_samples_per_pixel(tile)
+            if samples_per_pixel < 1:
+                continue
+            for i in range(tile_y_min, tile_y_max):
+                for j in range(tile_x_min, tile_x_max):
+                    pixel_color = Color.zero()
+                    for _ in range(samples_per_pixel):
+                        ray = self.get_ray(j, i)
+                        pixel_color = pixel_color + self.ray_color(
+                            ray, self.max_depth, world
+                        )
+                    pixels[i - y_min][j - x_min] = pixel_color / samples_per_pixel
+
+        sys.stdout.write(f"P3\n{self.window_width} {self.window_height}\n255\n")
+        for row in pixels:
+            for pixel_color in row:
+                write_color(sys.stdout, Color.from_vector(pixel_color))
+
+        sys.stderr.write("\nDone.\n")
+
+    def save_image(self, pixels: list[list[Vector3]]):
+        """
+        Write an image to `output_path` following the P3 PPM format. The file is
+        replaced atomically, so it can be watched while a progressive render is running.
+        """
+        temporary_path = f"{self.output_path}.tmp"
+        with open(temporary_path, "w") as out:
+            out.write(f"P3\n{self.window_width} {self.window_height}\n255\n")
+            for row in pixels:
+                for pixel_color in row:
+                    write_color(out, Color.from_vector(pixel_color))
+        os.replace(temporary_path, self.output_path)
+
+    def render_preview(self, world: HittableList):
+        """
+        Render a low-resolution preview of the crop window with one sample per
+        `preview_scale` wide block of pixels, upscaled to the full resolution.
+        """
+        x_min, y_min, x_max, y_max = self.window
+        scale = max(1, self.preview_scale)
+        preview = [
+            [Vector3.zero() for _ in range(self.window_width)]
+            for _ in range(self.window_height)
+        ]
+        for i in range(y_min, y_max, scale):
+            for j in range(x_min, x_max, scale):
+                # Sample the pixel at the center of the block
+                ray = self.get_ray(
+                    min(j + scale // 2, x_max - 1), min(i + scale // 2, y_max - 1)
+                )
+                pixel_color = self.ray_color(ray, self.max_depth, world)
+                for k in range(i, min(i + scale, y_max)):
+                    for m in range(j, min(j + scale, x_max)):
+                        preview[k - y_min][m - x_min] = pixel_color
+        return preview
+
+    def render_progressive(self, world: HittableList):
+        """
+        Render a low-resolution preview, then refine it in full-resolution passes of one
+        sample per pixel until each tile reaches its samples per pixel or `time_budget`
+        is reached. Each pass visits tiles by priority. The current image is saved to
+        `output_path` every `save_interval` seconds and when done.
+        """
+        self.initialize()
+
+        start = time.monotonic()
+        deadline = math.inf if self.time_budget is None else start + self.time_budget
+
+        preview = self.render_preview(world)
+        self.save_image(preview)
+        last_save = time.monotonic()
+
+        x_min, y_min, _, _ = self.window
+        sums = [
+            [Vector3.zero() for _ in range(self.window_width)]
+            for _ in range(self.window_height)
+        ]
+        counts = [[0] * self.window_width for _ in range(self.window_height)]
+
+        def current_image():
+            # Pixels without any sample yet keep their preview value
+            return [
+                [
+                    sums[i][j] / counts[i][j] if counts[i][j] > 0 else preview[i][j]
+                    for j in range(self.window_width)
+                ]
+                for i in range(self.window_height)
+            ]
+
+        tiles = [
+            (self.tile_samples_per_pixel(tile), bounds) for tile, bounds in self.tiles()
+        ]
+        total_passes = max(samples_per_pixel for samples_per_pixel, _ in tiles)
+        completed_passes = 0
+        out_of_time = False
+        while completed_passes < total_passes and not out_of_time:
+            for samples_per_pixel, bounds in tiles:
+                if completed_passes >= samples_per_pixel:
+                    continue
+                tile_x_min, tile_y_min, tile_x_max, tile_y_max = bounds
+                for i in range(tile_y_min, tile_y_max):
+                    if time.monotonic() >= deadline:
+                        out_of_time = True
+                        break
+                    sums_row = sums[i - y_min]
+                    counts_row = counts[i - y_min]
+                    for j in range(tile_x_min, tile_x_max):
+                        ray = self.get_ray(j, i)
+                        sums_row[j - x_min] = sums_row[j - x_min] + self.ray_color(
+                            ray, self.max_depth, world
+                        )
+                        counts_row[j - x_min] += 1
+                    if time.monotonic() - last_save >= self.save_interval:
+                        self.save_image(current_image())
+                        last_save = time.monotonic()
+                if out_of_time:
+                    break
+            else:
+                completed_passes += 1
+            sys.stderr.write(
+                f"\rSamples per pixel: {completed_passes}/{total_passes}"
+                f" ({time.monotonic() - start:.1f} s)"
+            )
             sys.stderr.flush()
-            for j in range(self.image_width):
-                pixel_color = Color.zero()
-                for _ in range(self.samples_per_pixel):
-                    ray = self.get_ray(j, i)
-                    pixel_color = pixel_color + self.ray_color(
-                        ray, self.max_depth, world
-                    )
-                write_color(sys.stdout, self.pixel_samples_scale * pixel_color)
 
+        self.save_image(current_image())
         sys.stderr.write("\nDone.\n")